@@ -3,6 +3,9 @@ Unix-style Argument Parser
 Provides a unified parameter parser for classic Unix command behavior
 """
 
+import functools
+from types import MappingProxyType
+
 
 class UnixArgParser:
     """
@@ -11,9 +14,12 @@ class UnixArgParser:
     - Combined short options: -la, -rf
     - Separate short options: -l -a
     - Options with values: -n 10
+    - Numeric options: -9, -15 (stored as the 'number' option)
     - Positional arguments
     """
 
+    __slots__ = ('flags', 'options', 'positionals')
+
     def __init__(self):
         self.flags = set()
         self.options = {}
@@ -29,46 +35,43 @@ class UnixArgParser:
         Returns:
             Self for chaining
         """
-        i = 0
-        while i < len(args):
-            arg = args[i]
+        # Bind containers locally to keep attribute lookups out of the loop
+        flags = self.flags
+        options = self.options
+        positionals = self.positionals
 
-            if arg.startswith('-') and len(arg) > 1 and arg != '--':
+        for i, arg in enumerate(args):
+            if arg == '--':
+                # Everything after -- is positional
+                positionals.extend(args[i+1:])
+                break
+            elif arg[:1] == '-' and len(arg) > 1:
                 # This is an option
-                if arg.startswith('--'):
+                if arg[1] == '-':
                     # Long option (not commonly used in classic Unix)
                     option_name = arg[2:]
                     if '=' in option_name:
                         key, value = option_name.split('=', 1)
-                        self.options[key] = value
+                        options[key] = value
                     else:
-                        self.flags.add(option_name)
+                        flags.add(option_name)
+                elif arg[1:].isdecimal():
+                    # Numeric option (like kill -9) is a value, not a flag set;
+                    # isdecimal() accepts only what int() parses (isdigit() takes '²')
+                    options['number'] = int(arg[1:])
                 else:
                     # Short option(s)
-                    option_chars = arg[1:]
-
-                    # Check if this looks like a combined option (like -rf, -la, -aux)
-                    # Process each character as a separate flag
-                    for char in option_chars:
-                        self.flags.add(char)
-                i += 1
-            elif arg == '--':
-                # Everything after -- is positional
-                self.positionals.extend(args[i+1:])
-                break
+                    # Combined options (like -rf, -la, -aux) add each character as a separate flag
+                    flags.update(arg[1:])
             else:
                 # Positional argument
-                self.positionals.append(arg)
-                i += 1
+                positionals.append(arg)
 
         return self
 
     def has_flag(self, *flags):
         """Check if any of the given flags are present"""
-        for flag in flags:
-            if flag in self.flags:
-                return True
-        return False
+        return not self.flags.isdisjoint(flags)
 
     def get_option(self, name, default=None):
         """Get value of an option"""
@@ -83,15 +86,29 @@ class UnixArgParser:
         return bool(self.flags.intersection(flag_set))
 
 
+@functools.lru_cache(maxsize=256)
+def _parse_cached(args):
+    """Parse an argument tuple once; the result is shared between callers"""
+    parser = UnixArgParser().parse(args)
+
+    # Freeze the containers so no caller can modify the cached result
+    parser.flags = frozenset(parser.flags)
+    parser.options = MappingProxyType(parser.options)
+    parser.positionals = tuple(parser.positionals)
+    return parser
+
+
 def parse_unix_args(args):
     """
     Convenience function to parse Unix-style arguments
 
+    Results are cached per argument sequence, so the returned parser is
+    read-only: flags is a frozenset and positionals a tuple.
+
     Args:
         args: List of argument strings
 
     Returns:
         UnixArgParser instance with parsed arguments
     """
-    parser = UnixArgParser()
-    return parser.parse(args)
+    return _parse_cached(tuple(args))
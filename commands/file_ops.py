@@ -20,5 +20,5 @@ def execute_cat(vfs, args, print_func):
             if content and content.endswith('\n'):
                 content = content[:-1]
             if content:
-                for line in content.split('\n'):
-                    print_func(line)
+                # Emit the whole file in one call instead of once per line
+                print_func(content)
@@ -3,6 +3,7 @@ Filesystem Commands Module
 Implements directory navigation and listing commands
 """
 
+import sys
 import time
 from argparse_unix import parse_unix_args
 from config_loader import get_command_delay
@@ -41,10 +42,11 @@ def execute_ls(vfs, args, print_func):
     parsed = parse_unix_args(args)
 
     # Check for options
-    long_format = parsed.has_flag('l')
-    show_hidden = parsed.has_flag('a')
-    sort_by_time = parsed.has_flag('t')
-    reverse_sort = parsed.has_flag('r')
+    flags = parsed.flags
+    long_format = 'l' in flags
+    show_hidden = 'a' in flags
+    sort_by_time = 't' in flags
+    reverse_sort = 'r' in flags
 
     # Get paths
     paths = parsed.get_positionals()
@@ -59,9 +61,7 @@ def execute_ls(vfs, args, print_func):
             if long_format:
                 # Calculate total blocks (simplified)
                 total = len(entries) * 4
-                print_func(f"total {total}")
-                for entry in entries:
-                    print_func(entry)
+                print_func("\n".join([f"total {total}", *entries]))
             else:
                 # Print entries in columns (tab-separated)
                 if entries:
@@ -78,8 +78,9 @@ def execute_rm(vfs, args, print_func):
     parsed = parse_unix_args(args)
 
     # Check for options (handles -rf, -fr, -r, -f all correctly)
-    recursive = parsed.has_flag('r')
-    force = parsed.has_flag('f')
+    flags = parsed.flags
+    recursive = 'r' in flags
+    force = 'f' in flags
 
     # Get file paths
     paths = parsed.get_positionals()
@@ -103,6 +104,9 @@ def execute_rm(vfs, args, print_func):
         print_func("rm: no matches found")
         return
 
+    # Delay per file to simulate real file deletion (0 disables it)
+    delay = get_command_delay("rm")
+
     # Remove each matched file
     for path in expanded_paths:
         # Check if trying to delete /unix kernel
@@ -117,5 +121,6 @@ def execute_rm(vfs, args, print_func):
         if not success and not force:
             print_func(error)
 
-        # Add delay to simulate real file deletion
-        time.sleep(get_command_delay("rm"))
+        if delay:
+            sys.stdout.flush()
+            time.sleep(delay)
@@ -5,18 +5,48 @@ Implements commands that display system information
 
 from system_time import now
 from argparse_unix import parse_unix_args
-from process_table import ProcessTable
+from process_table import ProcessTable, Process
 import random
 
+# Flag combinations that select the full ps listing (-ef / -aux)
+_PS_EF = frozenset('ef')
+_PS_AUX = frozenset('aux')
+
+# Static output lines for df and the other logged-in users shown by who
+_DF_OUTPUT = "\n".join((
+    "Filesystem            kbytes    used   avail capacity  Mounted on",
+    "/dev/root              51200   28672   22528    56%    /",
+    "/dev/u                256000  189440   66560    74%    /u",
+    "tmpfs                  16384    1024   15360     7%    /tmp",
+    "/dev/swap              65536   12288   53248    19%    swap",
+))
+_WHO_OTHER_USERS = "\n".join((
+    "operator     tty2         Dec 10 23:15",
+    "admin        tty3         Dec 11 00:22",
+))
+
+# Header and the other users' rows of the w listing
+_W_HEADER = "User     tty       login@  idle   what"
+_W_OTHER_USERS = "\n".join((
+    "operator tty2      23:15    2:30  /usr/bin/vi",
+    "admin    tty3      00:22    1:23  /bin/sh",
+))
+
 # Global process table instance
-_process_table = None
+_process_table = ProcessTable()
+
+# Login shell PID per user (username -> pid)
+_shell_pids = {}
+
+# Random draws for a free login shell PID before falling back to the next one up
+_SHELL_PID_DRAWS = 50
+
+# Own generator for simulated PIDs, bound once
+_randint = random.Random().randint
 
 
 def get_process_table():
-    """Get or create the global process table instance"""
-    global _process_table
-    if _process_table is None:
-        _process_table = ProcessTable()
+    """Get the global process table instance"""
     return _process_table
 
 
@@ -27,19 +57,15 @@ def execute_date(vfs, args, print_func):
 
 def execute_who(username, args, print_func):
     """Execute who command - display logged in users"""
-    print_func(f"{username:<12} tty1a        {now().strftime('%b %d %H:%M')}")
-    print_func(f"operator     tty2         Dec 10 23:15")
-    print_func(f"admin        tty3         Dec 11 00:22")
+    print_func(f"{username:<12} tty1a        {now().strftime('%b %d %H:%M')}\n{_WHO_OTHER_USERS}")
 
 
 def execute_w(username, args, print_func):
     """Execute w command - display users and their activities"""
-    current_time = now().strftime('%H:%M:%S')
-    print_func(f" {current_time}  up 23 days,  4:32,  3 users")
-    print_func(f"User     tty       login@  idle   what")
-    print_func(f"{username:<8} tty1a     {now().strftime('%H:%M')}    0     -sh")
-    print_func(f"operator tty2      23:15    2:30  /usr/bin/vi")
-    print_func(f"admin    tty3      00:22    1:23  /bin/sh")
+    # Format the clock once; the login column is its HH:MM prefix
+    clock = now().strftime('%H:%M:%S')
+    print_func(f" {clock}  up 23 days,  4:32,  3 users\n{_W_HEADER}\n"
+               f"{username:<8} tty1a     {clock[:5]}    0     -sh\n{_W_OTHER_USERS}")
 
 
 def execute_whoami(username, args, print_func):
@@ -54,53 +80,57 @@ def execute_uptime(vfs, args, print_func):
 
 def execute_df(vfs, args, print_func):
     """Execute df command - report filesystem disk space usage"""
-    print_func("Filesystem            kbytes    used   avail capacity  Mounted on")
-    print_func("/dev/root              51200   28672   22528    56%    /")
-    print_func("/dev/u                256000  189440   66560    74%    /u")
-    print_func("tmpfs                  16384    1024   15360     7%    /tmp")
-    print_func("/dev/swap              65536   12288   53248    19%    swap")
+    print_func(_DF_OUTPUT)
 
 
 def execute_ps(username, args, print_func):
     """Execute ps command - report process status"""
     # Get process table
-    ptable = get_process_table()
+    ptable = _process_table
 
     # Parse arguments using unified parser
     parsed = parse_unix_args(args)
 
     # Check for full listing options (handles -ef, -e -f, -aux, -a -u -x)
-    full_listing = (parsed.has_flag('e') and parsed.has_flag('f')) or \
-                   (parsed.has_flag('a') and parsed.has_flag('u') and parsed.has_flag('x'))
-
-    # Add current shell and ps process for this user
-    shell_pid = random.randint(800, 899)
-    ps_pid = random.randint(900, 999)
-
-    # Temporarily add shell and ps processes
-    shell_proc_exists = ptable.get_process(shell_pid) is None
+    full_listing = parsed.flags.issuperset(_PS_EF) or parsed.flags.issuperset(_PS_AUX)
+
+    # Login shell PID is chosen once per user and reused by later ps calls
+    shell_pid = _shell_pids.get(username)
+    if shell_pid is None:
+        # Redraw until the PID is free: the table is shared by all sessions
+        taken = set(_shell_pids.values())
+        for _ in range(_SHELL_PID_DRAWS):
+            shell_pid = _randint(800, 899)
+            if shell_pid not in taken and ptable.get_process(shell_pid) is None:
+                break
+        else:
+            # Crowded range: take the first PID above every one in use
+            taken.update(proc.pid for proc in ptable.get_all_processes())
+            shell_pid = max(taken) + 1
+        _shell_pids[username] = shell_pid
+    ps_pid = _randint(900, 999)
+    stime = now().strftime('%H:%M')
+
+    # The shell stays in the table once added (it is re-added if killed)
+    if ptable.get_process(shell_pid) is None:
+        ptable.add_process(Process(shell_pid, 1, username, "-sh", "tty1a", stime, "0:00"))
+
+    # Temporarily add the ps process
     ps_proc_exists = ptable.get_process(ps_pid) is None
 
-    if shell_proc_exists:
-        from process_table import Process
-        shell_proc = Process(shell_pid, 1, username, "-sh", "tty1a", now().strftime('%H:%M'), "0:00")
-        ptable.add_process(shell_proc)
-
     if ps_proc_exists:
-        from process_table import Process
-        ps_proc = Process(ps_pid, shell_pid, username, "ps " + " ".join(args), "tty1a", now().strftime('%H:%M'), "0:00")
+        # Only the full listing shows arguments; the short one prints just "ps"
+        ps_command = "ps " + " ".join(args) if full_listing else "ps"
+        ps_proc = Process(ps_pid, shell_pid, username, ps_command, "tty1a", stime, "0:00")
         ptable.add_process(ps_proc)
 
     # Get formatted output from process table
     output_lines = ptable.format_ps_output(full_listing=full_listing, filter_user=None if full_listing else username)
 
-    # Print all lines
-    for line in output_lines:
-        print_func(line)
+    # Print all lines in one call
+    print_func("\n".join(output_lines))
 
-    # Clean up temporary processes
-    if shell_proc_exists:
-        ptable.remove_process(shell_pid)
+    # Clean up temporary ps process
     if ps_proc_exists:
         ptable.remove_process(ps_pid)
 
@@ -27,17 +27,10 @@ def execute_kill(username, args, print_func):
         print_func("TSTP CONT TTIN TTOU VTALRM PROF XCPU XFSZ WAITING LWP")
         return
 
-    # Extract signal number (default is 15 - SIGTERM)
-    signal = 15
-    pids = []
-
-    for arg in args:
-        if arg.startswith('-') and len(arg) > 1 and arg[1:].isdigit():
-            # Signal specified as -9, -15, etc.
-            signal = int(arg[1:])
-        elif arg.isdigit():
-            # PID
-            pids.append(int(arg))
+    # Signal number from -9, -15, etc. (default is 15 - SIGTERM)
+    # The parser keeps a numeric option such as -9 as 'number'
+    signal = parsed.get_option('number', 15)
+    pids = [int(arg) for arg in parsed.get_positionals() if arg.isdecimal()]
 
     if not pids:
         print_func("kill: no process ID specified")
@@ -3,23 +3,28 @@ System Commands Module
 Implements system utility commands
 """
 
+import functools
 import json
 import os
+import sys
+
+# VT100 erase display + cursor home
+_CLEAR_SCREEN = "\x1b[2J\x1b[H"
 
 
 def execute_clear(vfs, args, print_func):
     """Execute clear command - clear the terminal screen"""
-    # Simple clear using many blank lines
-    print("\n" * 50)
+    # Flushed with the next prompt, like any other command output
+    sys.stdout.write(_CLEAR_SCREEN)
 
 
-def execute_help(vfs, args, print_func):
-    """Execute help command - show available commands"""
+@functools.lru_cache(maxsize=1)
+def _build_help_text():
+    """Build the help text from commands.json once and cache the result"""
     # Load commands from commands.json to generate dynamic help
     commands_file = "commands.json"
 
-    print_func("\nAvailable UNIX commands:")
-    print_func("-" * 60)
+    lines = ["\nAvailable UNIX commands:", "-" * 60]
 
     try:
         if os.path.exists(commands_file):
@@ -33,18 +38,24 @@ def execute_help(vfs, args, print_func):
                 description = cmd.get("description", "")
 
                 # Format: "  usage - description"
-                print_func(f"  {usage:<20} - {description}")
+                lines.append(f"  {usage:<20} - {description}")
         else:
             # Fallback to basic help if commands.json not found
-            print_func("  Commands configuration file not found")
+            lines.append("  Commands configuration file not found")
 
     except Exception as e:
-        print_func(f"  Error loading help: {e}")
+        lines.append(f"  Error loading help: {e}")
 
     # Add built-in commands not in commands.json
-    print_func("  history              - show command history")
-    print_func("  exit, logout         - log out of the system")
-    print_func("-" * 60)
+    lines.append("  history              - show command history")
+    lines.append("  exit, logout         - log out of the system")
+    lines.append("-" * 60)
+    return "\n".join(lines)
+
+
+def execute_help(vfs, args, print_func):
+    """Execute help command - show available commands"""
+    print_func(_build_help_text())
 
 
 def execute_alias(aliases, args, print_func):
@@ -55,8 +66,7 @@ def execute_alias(aliases, args, print_func):
             # No output if no aliases defined (standard Unix behavior)
             pass
         else:
-            for name, value in sorted(aliases.items()):
-                print_func(f"{name}='{value}'")
+            print_func("\n".join(f"{name}='{value}'" for name, value in sorted(aliases.items())))
     else:
         # Parse alias definition
         alias_def = " ".join(args)
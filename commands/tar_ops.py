@@ -4,12 +4,16 @@ Implements tar archive creation and extraction
 """
 
 import io
+import sys
 import time
 import tarfile
 from vfs import VNode
 from argparse_unix import parse_unix_args
 from config_loader import get_command_delay
 
+# Copy member bodies into the archive in 1 MiB blocks (tarfile default is 16 KiB)
+_TAR_COPY_BUFSIZE = 1024 * 1024
+
 
 def execute_tar(vfs, args, print_func):
     """Execute tar command - create or extract tar archives"""
@@ -74,13 +78,13 @@ def execute_tar(vfs, args, print_func):
                     parent=parent,
                     permissions="rw-r--r--"
                 )
-                tar_node.content = tar_content
+                tar_node.content_bytes = tar_content
                 tar_node.size = len(tar_content)
                 parent.add_child(tar_node)
 
                 # Print verbose output if requested
                 if verbose:
-                    _print_tar_contents(target, print_func, "a")
+                    _print_tar_contents(target, print_func, "a", delay=get_command_delay("tar"))
 
     elif is_extract:
         # Extract tar archive
@@ -91,8 +95,8 @@ def execute_tar(vfs, args, print_func):
             print_func(f"tar: {tarfile_name}: Is a directory")
         else:
             # Extract tar archive
-            if tar_node.content:
-                _extract_tar(vfs, tar_node.content, print_func, verbose)
+            if tar_node.content_bytes:
+                _extract_tar(vfs, tar_node.content_bytes, print_func, verbose)
             else:
                 print_func(f"tar: {tarfile_name}: Empty archive")
 
@@ -104,70 +108,86 @@ def execute_tar(vfs, args, print_func):
 def _create_tar(root_node):
     """Create a tar archive from a virtual directory tree"""
     tar_buffer = io.BytesIO()
-    with tarfile.open(fileobj=tar_buffer, mode='w') as tar:
+    with tarfile.open(fileobj=tar_buffer, mode='w', copybufsize=_TAR_COPY_BUFSIZE) as tar:
         _add_to_tar(tar, root_node, root_node.name)
     return tar_buffer.getvalue()
 
 
-def _add_to_tar(tar, node, arcname):
-    """Recursively add nodes to tar archive"""
-    info = tarfile.TarInfo(name=arcname)
-    info.mtime = int(node.mtime.timestamp())
-    info.uid = 0
-    info.gid = 0
-    info.uname = node.owner
-    info.gname = node.group
-
-    if node.is_dir:
-        info.type = tarfile.DIRTYPE
-        info.mode = 0o755
-        tar.addfile(info)
-        # Add children
-        for child_name, child_node in node.children.items():
-            # Avoid double slashes when arcname is "/"
-            if arcname == "/":
-                child_arcname = child_name
-            elif arcname.endswith("/"):
-                child_arcname = f"{arcname}{child_name}"
+def _child_prefix(path):
+    """Get the prefix for names below path, avoiding double slashes"""
+    if path == "/":
+        return ""
+    if path.endswith("/"):
+        return path
+    return path + "/"
+
+
+def _add_to_tar(tar, root_node, root_arcname):
+    """Add a node and everything below it to the tar archive"""
+    # Explicit stack instead of recursion; entries are (node, arcname)
+    stack = [(root_node, root_arcname)]
+    while stack:
+        node, arcname = stack.pop()
+
+        info = tarfile.TarInfo(name=arcname)
+        info.mtime = int(node.mtime.timestamp())
+        info.uid = 0
+        info.gid = 0
+        info.uname = node.owner
+        info.gname = node.group
+
+        if node.is_dir:
+            info.type = tarfile.DIRTYPE
+            info.mode = 0o755
+            tar.addfile(info)
+            # Push children in reverse so they are archived in directory order
+            child_prefix = _child_prefix(arcname)
+            for child_name, child_node in reversed(node.children.items()):
+                stack.append((child_node, child_prefix + child_name))
+        else:
+            info.type = tarfile.REGTYPE
+            info.mode = 0o644
+            # Encode once; the byte length is also the correct tar member size
+            content_bytes = node.content_bytes
+            if content_bytes:
+                info.size = len(content_bytes)
+                tar.addfile(info, io.BytesIO(content_bytes))
             else:
-                child_arcname = f"{arcname}/{child_name}"
-            _add_to_tar(tar, child_node, child_arcname)
-    else:
-        info.type = tarfile.REGTYPE
-        info.mode = 0o644
-        info.size = len(node.content) if node.content else 0
-        content_bytes = node.content.encode('utf-8') if node.content else b''
-        tar.addfile(info, io.BytesIO(content_bytes))
-
-
-def _print_tar_contents(node, print_func, prefix="a", path=""):
-    """Print tar archive contents in verbose mode"""
-    # Avoid double slashes when constructing paths
-    if not path:
-        current_path = node.name
-    elif path == "/":
-        current_path = node.name
-    elif path.endswith("/"):
-        current_path = f"{path}{node.name}"
-    else:
-        current_path = f"{path}/{node.name}"
+                # Empty file: header only, no body to copy
+                tar.addfile(info)
+
 
-    print_func(f"{prefix} {current_path}")
+def _print_tar_contents(node, print_func, prefix="a", path="", delay=0.0):
+    """Print tar archive contents in verbose mode (path is the parent prefix)"""
+    # Explicit stack instead of recursion; entries are (node, display path)
+    stack = [(node, path + node.name)]
+    while stack:
+        node, current_path = stack.pop()
 
-    # Add delay to simulate real tar processing
-    time.sleep(get_command_delay("tar"))
+        print_func(f"{prefix} {current_path}")
 
-    if node.is_dir:
-        for child_name, child_node in sorted(node.children.items()):
-            _print_tar_contents(child_node, print_func, prefix, current_path)
+        # Add delay to simulate real tar processing
+        if delay:
+            sys.stdout.flush()
+            time.sleep(delay)
+
+        if node.is_dir:
+            # Push sorted children in reverse so they are printed in name order
+            child_prefix = _child_prefix(current_path)
+            for child_name, child_node in reversed(node.sorted_children()):
+                stack.append((child_node, child_prefix + child_name))
 
 
 def _extract_tar(vfs, tar_content, print_func, verbose=True):
     """Extract a tar archive to the virtual filesystem"""
     tar_buffer = io.BytesIO(tar_content)
+    delay = get_command_delay("tar")
+    # Parent directory nodes already resolved, keyed by their archive path
+    dir_cache = {"": vfs.current_dir}
     try:
         with tarfile.open(fileobj=tar_buffer, mode='r') as tar:
-            for member in tar.getmembers():
+            # Iterate lazily so members are parsed as extraction proceeds
+            for member in tar:
                 # Print extraction (verbose mode)
                 if verbose:
                     print_func(f"x {member.name}")
@@ -177,21 +197,22 @@ def _extract_tar(vfs, tar_content, print_func, verbose=True):
                     continue
 
                 # Parse path
-                path_parts = member.name.split('/')
-
-                # Navigate to parent directory
-                parent = vfs.current_dir
-                for part in path_parts[:-1]:
-                    if part not in parent.children:
-                        # Create intermediate directory
-                        new_dir = VNode(part, is_dir=True)
-                        parent.add_child(new_dir)
-                        parent = new_dir
-                    else:
-                        parent = parent.children[part]
+                parent_path, _, name = member.name.rpartition('/')
+
+                # Navigate to parent directory (walked once per distinct directory)
+                parent = dir_cache.get(parent_path)
+                if parent is None:
+                    parent = vfs.current_dir
+                    for part in parent_path.split('/'):
+                        child = parent.children.get(part)
+                        if child is None:
+                            # Create intermediate directory
+                            child = VNode(part, is_dir=True)
+                            parent.add_child(child)
+                        parent = child
+                    dir_cache[parent_path] = parent
 
                 # Create the file or directory
-                name = path_parts[-1]
                 if member.isdir():
                     if name not in parent.children:
                         new_dir = VNode(name, is_dir=True)
@@ -199,15 +220,28 @@ def _extract_tar(vfs, tar_content, print_func, verbose=True):
                 else:
                     # Extract file content
                     file_content = tar.extractfile(member)
-                    content = file_content.read().decode('utf-8') if file_content else ""
+                    content_bytes = file_content.read() if file_content else b""
 
+                    # Keep the raw bytes; text is decoded only when the file is read
                     new_file = VNode(name, is_dir=False)
-                    new_file.content = content
-                    new_file.size = len(content)
+                    new_file.content_bytes = content_bytes
+                    new_file.size = len(content_bytes)
+
+                    # A file replacing a directory detaches it: forget the
+                    # cached nodes at and below that path
+                    replaced = parent.children.get(name)
+                    if replaced is not None and replaced.is_dir:
+                        path = f"{parent_path}/{name}" if parent_path else name
+                        below = path + "/"
+                        for key in [k for k in dir_cache if k == path or k.startswith(below)]:
+                            del dir_cache[key]
+
                     parent.add_child(new_file)
 
                 # Add delay to simulate real tar processing
-                time.sleep(get_command_delay("tar"))
+                if delay:
+                    sys.stdout.flush()
+                    time.sleep(delay)
 
     except Exception as e:
         print_func(f"tar: Error extracting archive: {e}")
@@ -14,8 +14,14 @@ DEFAULT_CONFIG = {
     }
 }
 
+# Path of config.json next to this module
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'config.json')
+
 _config = None
 
+# Flat command -> delay table, built from the configuration on first use
+_delay_table = None
+
 
 def load_config():
     """Load configuration from config.json"""
@@ -23,14 +29,11 @@ def load_config():
     if _config is not None:
         return _config
 
-    config_path = os.path.join(os.path.dirname(__file__), 'config.json')
-
     try:
-        if os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                _config = json.load(f)
-        else:
-            _config = DEFAULT_CONFIG
+        with open(CONFIG_PATH, 'r') as f:
+            _config = json.load(f)
+    except FileNotFoundError:
+        _config = DEFAULT_CONFIG
     except Exception as e:
         print(f"Warning: Error loading config.json: {e}")
         print("Using default configuration values.")
@@ -39,11 +42,19 @@ def load_config():
     return _config
 
 
+def _build_delay_table(config):
+    """Flatten command_delays into a command -> delay dict (defaults first)"""
+    table = {}
+    for delays in (DEFAULT_CONFIG["command_delays"], config.get("command_delays", {})):
+        for command, settings in delays.items():
+            if isinstance(settings, dict) and "delay" in settings:
+                table[command] = settings["delay"]
+    return table
+
+
 def get_command_delay(command):
     """Get the delay value for a specific command"""
-    config = load_config()
-    try:
-        return config["command_delays"][command]["delay"]
-    except KeyError:
-        # Return default values if not found
-        return DEFAULT_CONFIG["command_delays"].get(command, {}).get("delay", 0.0)
+    global _delay_table
+    if _delay_table is None:
+        _delay_table = _build_delay_table(load_config())
+    return _delay_table.get(command, 0.0)
@@ -20,29 +20,25 @@ def demo_commands():
     vfs = VirtualFileSystem()
     shell = Shell("root", vfs)
 
+    # (displayed command, executed command, description, output truncated)
+    # The shell has no pipes, so piped demos execute only their first stage
     commands_to_demo = [
-        ("ps -ef | grep dxmail", "Show all PP X.400 MTA processes"),
-        ("ps -ef", "Show all system processes (including MTA)"),
-        ("ls -l /home/dxmail/pp/queue/in", "Show incoming messages (first 20)"),
-        ("ls -l /home/dxmail/pp/queue/out", "Show outgoing messages (first 20)"),
+        ("ps -ef | grep dxmail", "ps -ef", "Show all PP X.400 MTA processes", False),
+        ("ps -ef", "ps -ef", "Show all system processes (including MTA)", False),
+        ("ls -l /home/dxmail/pp/queue/in", "ls -l /home/dxmail/pp/queue/in", "Show incoming messages (first 20)", True),
+        ("ls -l /home/dxmail/pp/queue/out", "ls -l /home/dxmail/pp/queue/out", "Show outgoing messages (first 20)", True),
     ]
 
-    for cmd, description in commands_to_demo:
+    for cmd, executed_cmd, description, truncated in commands_to_demo:
         print(f"\n{'─' * 70}")
         print(f"Command: {cmd}")
         print(f"Description: {description}")
         print(f"{'─' * 70}")
 
-        # Handle piped commands
-        if '|' in cmd:
-            # For demo, just execute the first part
-            main_cmd = cmd.split('|')[0].strip()
-            shell.execute_command(main_cmd)
-        else:
-            shell.execute_command(cmd)
+        shell.execute_command(executed_cmd)
 
         # Limit output for ls commands
-        if cmd.startswith("ls"):
+        if truncated:
             print("... (showing first entries only)")
 
     print(f"\n{'=' * 70}")
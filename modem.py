@@ -3,40 +3,221 @@ Modem Simulator Module
 Implements the modem dial-in and connection simulation
 """
 
+import os
 import sys
+import hmac
 import time
+import hashlib
 import random
 import getpass
-from system_time import now
+import threading
+from collections import OrderedDict
+from system_time import now, get_system_time
+
+# Number of characters slow_print reveals per write
+_SLOW_PRINT_CHUNK = 8
+
+# How far behind schedule pacing may fall and still catch up; anything
+# later (e.g. waiting for input) starts a new schedule
+_PACE_SLACK = 0.1
+
+# PBKDF2 work factor for the stored password hashes
+_PBKDF2_ITERATIONS = 100000
+
+# Verified logins are remembered for this many seconds, up to this many entries
+_VERIFY_CACHE_TTL = 300
+_VERIFY_CACHE_SIZE = 1000
+
+# Horizontal rules used by the banners
+_BAR = "=" * 60
+_RULE = "-" * 60
+
+# Static banners, joined once at import and emitted with a single print each
+_DIAL_BANNER = "\n".join([
+    "\n" + _BAR,
+    "     MODEM COMMUNICATIONS SIMULATOR v2.4",
+    "     Copyright (C) 1995-1998",
+    _BAR + "\n",
+])
+
+_LOGIN_BANNER = "\n".join([
+    "\n" + _BAR,
+    "",
+    "     ███████╗ ██████╗ ██████╗     ██╗   ██╗███╗   ██╗██╗██╗  ██╗",
+    "     ██╔════╝██╔════╝██╔═══██╗    ██║   ██║████╗  ██║██║╚██╗██╔╝",
+    "     ███████╗██║     ██║   ██║    ██║   ██║██╔██╗ ██║██║ ╚███╔╝ ",
+    "     ╚════██║██║     ██║   ██║    ██║   ██║██║╚██╗██║██║ ██╔██╗ ",
+    "     ███████║╚██████╗╚██████╔╝    ╚██████╔╝██║ ╚████║██║██╔╝ ██╗",
+    "     ╚══════╝ ╚═════╝ ╚═════╝      ╚═════╝ ╚═╝  ╚═══╝╚═╝╚═╝  ╚═╝",
+    "",
+    "     SCO UNIX System V/386 Release 3.2",
+    "     Copyright (C) 1976-1995 The Santa Cruz Operation, Inc.",
+    _BAR,
+])
+
+_LOGIN_FOOTER = "\n".join([
+    "Last successful connection: Dec 08 23:15:42 1995",
+    "\n" + _RULE,
+])
+
+_WELCOME_HEADER = "\n".join([
+    "\n" + _BAR,
+    "  SCO UNIX System V/386 Release 3.2",
+    _BAR,
+])
+
+_WELCOME_FOOTER = "\n".join([
+    "Terminal: vt100",
+    "\nYou have mail.",
+    "\n" + _RULE,
+    "SCO UNIX System V/386 Release 3.2 (scohost)",
+    _RULE + "\n",
+])
+
+_CLOSED_BANNER = "\n".join([
+    "\n" + _BAR,
+    "  Connection closed",
+    _BAR + "\n",
+])
+
+# Modem init string sent before dialing, as (command, response) pairs
+_AT_COMMANDS = (
+    ("AT", "OK"),
+    ("ATZ", "OK"),
+    ("ATE1", "OK"),
+    ("ATM1", "OK"),
+    ("ATX4", "OK"),
+    ("ATDT 555-1234", ""),
+)
+
+_DIAL_SOUNDS = ("BEEP ",) * 7
+_DIAL_TONE = "".join(_DIAL_SOUNDS)
+
+# Modem handshake sounds as text
+_HANDSHAKE = (
+    "RRRRR.....",
+    "KSSSSSHHHHhhhh....",
+    "BEEEEeeeeee....",
+    "WRRRRrrrrrr....",
+    "CHHHhhhhh....",
+)
+_HANDSHAKE_TEXT = "".join(sound + "\n" for sound in _HANDSHAKE)
+# Typing delay of 0.02s per character plus 0.3s after each sound
+_HANDSHAKE_DELAY = sum(0.02 * len(sound) + 0.3 for sound in _HANDSHAKE)
+
+
+def _hash_password(password, salt):
+    """Derives the PBKDF2-SHA256 hash of a password"""
+    return hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, _PBKDF2_ITERATIONS)
+
+
+# Salted hashes shared by all simulators in the process (one per web session),
+# keyed by (username, password), so each entry is derived only once
+_shared_hashes = {}
+_shared_dummy_hash = None
+_shared_hashes_lock = threading.Lock()
+
+
+def _shared_password_hashes(users):
+    """Returns the salted hashes for a user table and the dummy hash"""
+    global _shared_dummy_hash
+    hashes = {}
+    # Held while hashing, so concurrent first logins wait and reuse the result
+    with _shared_hashes_lock:
+        for username, password in users.items():
+            entry = _shared_hashes.get((username, password))
+            if entry is None:
+                salt = os.urandom(16)
+                entry = (salt, _hash_password(password, salt))
+                _shared_hashes[(username, password)] = entry
+            hashes[username] = entry
+        if _shared_dummy_hash is None:
+            salt = os.urandom(16)
+            _shared_dummy_hash = (salt, _hash_password(os.urandom(16).hex(), salt))
+        return hashes, _shared_dummy_hash
 
 
 class ModemSimulator:
     """Simulates a classic modem login experience"""
 
-    def __init__(self):
+    def __init__(self, fast=False, virtual_time=False):
+        # Fast mode prints everything instantly and skips all pauses;
+        # virtual time does the same but advances the simulated clock instead
+        self.fast = fast or virtual_time
+        self.virtual_time = virtual_time
         self.connected = False
         self.logged_in = False
         self.username = None
+        # getpass only makes sense on a terminal; piped input is read directly
+        self.interactive = sys.stdin.isatty()
+        # Typewriter effects are only worth their syscalls on a terminal
+        self.tty_output = sys.stdout.isatty()
+        # Own generator so the simulator does not share the module-level one
+        self._randint = random.Random().randint
+        # Monotonic time the current run of pauses is scheduled to end at
+        self._deadline = None
 
-        # Default users for demo (in production passwords should be hashed)
+        # Default users for demo (hashed on first login, see _get_password_hashes)
         self.users = {
             "root": "materna123",
             "sysadmin": "admin123",
             "user": "password",
             "guest": "guest"
         }
+        self._password_hashes = None
+        # Copy of self.users the hashes were derived from
+        self._hashed_users = None
+        # Compared against for unknown users, so they cost a hash as well
+        self._dummy_hash = None
+        # (username, keyed hash of the attempt) -> (result, expiry), oldest first
+        self._verify_cache = OrderedDict()
+        # Secret HMAC key for the cache, so its keys are no fast hash of a password
+        self._cache_key = os.urandom(32)
 
-    def slow_print(self, text, delay=0.05):
-        """Prints text character by character for authentic retro effect"""
-        for char in text:
-            sys.stdout.write(char)
+    def pause(self, seconds):
+        """Waits for the given time unless fast mode is enabled"""
+        if self.virtual_time:
+            get_system_time().advance(seconds=seconds)
+        elif not self.fast:
+            # Show everything written so far before going quiet
             sys.stdout.flush()
-            time.sleep(delay)
-        print()
+            self._pace(seconds)
+
+    def _pace(self, seconds):
+        """Sleeps so that consecutive pauses add up to their scripted total"""
+        current = time.monotonic()
+        deadline = self._deadline
+        # Absorb oversleeping and the time spent writing since the last
+        # pause, unless the schedule was interrupted for longer than that
+        if deadline is None or current - deadline > _PACE_SLACK:
+            deadline = current
+        self._deadline = deadline + seconds
+        if self._deadline > current:
+            time.sleep(self._deadline - current)
+
+    def slow_print(self, text, delay=0.05):
+        """Prints text a few characters at a time for authentic retro effect"""
+        if self.fast or not self.tty_output:
+            # No one to animate for: write the line once, keep the total delay
+            # (pause() flushes before it waits)
+            sys.stdout.write(text + "\n")
+            self.pause(delay * len(text))
+            return
+        # One write/flush/sleep per chunk; the total delay stays delay per character
+        write = sys.stdout.write
+        flush = sys.stdout.flush
+        pace = self._pace
+        for i in range(0, len(text), _SLOW_PRINT_CHUNK):
+            chunk = text[i:i + _SLOW_PRINT_CHUNK]
+            write(chunk)
+            flush()
+            pace(delay * len(chunk))
+        write("\n")
 
     def print_instant(self, text):
         """Prints text instantly"""
-        print(text)
+        # One write for text and newline (print() issues two)
+        sys.stdout.write(f"{text}\n")
 
     def simulate_modem_dial(self, print_func=None, slow_print_func=None):
         """Simulates the modem dial-in process"""
@@ -44,89 +225,108 @@ class ModemSimulator:
         _print = print_func if print_func else self.print_instant
         _slow_print = slow_print_func if slow_print_func else self.slow_print
 
-        _print("\n" + "="*60)
-        _print("     MODEM COMMUNICATIONS SIMULATOR v2.4")
-        _print("     Copyright (C) 1995-1998")
-        _print("="*60 + "\n")
+        _print(_DIAL_BANNER)
 
-        time.sleep(0.5)
+        self.pause(0.5)
         _slow_print("Initializing modem...", 0.03)
-        time.sleep(0.3)
+        self.pause(0.3)
 
         # AT commands
-        at_commands = [
-            ("AT", "OK"),
-            ("ATZ", "OK"),
-            ("ATE1", "OK"),
-            ("ATM1", "OK"),
-            ("ATX4", "OK"),
-            ("ATDT 555-1234", "")
-        ]
-
-        for cmd, response in at_commands:
-            _slow_print(f"{cmd}", 0.02)
-            time.sleep(0.2)
+        for cmd, response in _AT_COMMANDS:
+            _slow_print(cmd, 0.02)
+            self.pause(0.2)
             if response:
                 _slow_print(response, 0.02)
-            time.sleep(0.3)
+            self.pause(0.3)
 
         # Simulate dialing sounds
         _print("")
         _slow_print("Dialing...", 0.04)
-        time.sleep(0.5)
+        self.pause(0.5)
 
-        dial_sounds = ["BEEP", "BEEP", "BEEP", "BEEP", "BEEP", "BEEP", "BEEP"]
-        for sound in dial_sounds:
-            if print_func:
-                print_func(sound + " ", end='')
-            else:
-                sys.stdout.write(sound + " ")
-                sys.stdout.flush()
-            time.sleep(0.15)
+        if print_func or self.tty_output:
+            for sound in _DIAL_SOUNDS:
+                if print_func:
+                    print_func(sound, end='')
+                else:
+                    # pause() flushes, so each beep still shows on its own tick
+                    sys.stdout.write(sound)
+                self.pause(0.15)
+        else:
+            # Not a terminal: all beeps in one write, then the combined pause
+            sys.stdout.write(_DIAL_TONE)
+            self.pause(0.15 * len(_DIAL_SOUNDS))
         _print("\n")
 
-        time.sleep(0.5)
+        self.pause(0.5)
         _slow_print("Connecting...", 0.04)
-        time.sleep(0.8)
-
-        # Modem handshake sounds as text
-        handshake = [
-            "RRRRR.....",
-            "KSSSSSHHHHhhhh....",
-            "BEEEEeeeeee....",
-            "WRRRRrrrrrr....",
-            "CHHHhhhhh...."
-        ]
-
-        for sound in handshake:
-            _slow_print(sound, 0.02)
-            time.sleep(0.3)
-
-        time.sleep(0.5)
+        self.pause(0.8)
+
+        if slow_print_func or self.tty_output:
+            for sound in _HANDSHAKE:
+                _slow_print(sound, 0.02)
+                self.pause(0.3)
+        else:
+            # Not a terminal: all sounds in one write, then the combined pause
+            sys.stdout.write(_HANDSHAKE_TEXT)
+            self.pause(_HANDSHAKE_DELAY)
+
+        self.pause(0.5)
         _print("")
         _slow_print("CONNECT 14400/V.32bis", 0.03)
         self.connected = True
-        time.sleep(0.5)
+        self.pause(0.5)
 
     def show_login_screen(self, print_func=None):
         """Displays the login screen"""
         _print = print_func if print_func else self.print_instant
 
-        _print("\n" + "="*60)
-        _print("")
-        _print("     ███████╗ ██████╗ ██████╗     ██╗   ██╗███╗   ██╗██╗██╗  ██╗")
-        _print("     ██╔════╝██╔════╝██╔═══██╗    ██║   ██║████╗  ██║██║╚██╗██╔╝")
-        _print("     ███████╗██║     ██║   ██║    ██║   ██║██╔██╗ ██║██║ ╚███╔╝ ")
-        _print("     ╚════██║██║     ██║   ██║    ██║   ██║██║╚██╗██║██║ ██╔██╗ ")
-        _print("     ███████║╚██████╗╚██████╔╝    ╚██████╔╝██║ ╚████║██║██╔╝ ██╗")
-        _print("     ╚══════╝ ╚═════╝ ╚═════╝      ╚═════╝ ╚═╝  ╚═══╝╚═╝╚═╝  ╚═╝")
-        _print("")
-        _print("     SCO UNIX System V/386 Release 3.2")
-        _print("     Copyright (C) 1976-1995 The Santa Cruz Operation, Inc.")
-        _print("="*60)
-        _print(f"\nSystem time: {now().strftime('%b %d %H:%M:%S %Y')}")
-        _print("Last successful connection: Dec 08 23:15:42 1995")
-        _print("\n" + "-"*60)
+        # Banner, clock and footer go out in a single print
+        _print(f"{_LOGIN_BANNER}\n\nSystem time: {now().strftime('%b %d %H:%M:%S %Y')}\n{_LOGIN_FOOTER}")
+
+    def set_password(self, username, password):
+        """Sets (or adds) a user's password and drops derived credentials"""
+        self.users[username] = password
+        self._invalidate_credentials()
+
+    def _invalidate_credentials(self):
+        """Forgets the password hashes and cached verdicts"""
+        self._password_hashes = None
+        self._hashed_users = None
+        self._verify_cache.clear()
+
+    def _get_password_hashes(self):
+        """Returns the salted password hashes, computing them once"""
+        if self._password_hashes is None:
+            self._password_hashes, self._dummy_hash = _shared_password_hashes(self.users)
+            self._hashed_users = dict(self.users)
+        return self._password_hashes
+
+    def authenticate(self, username, password):
+        """Checks a username/password pair against the user table"""
+        # self.users is public; edits that bypass set_password are caught here
+        if self._hashed_users is not None and self._hashed_users != self.users:
+            self._invalidate_credentials()
+
+        # Repeated attempts are answered from the cache instead of re-hashing
+        attempt = f"{username}\0{password}".encode('utf-8')
+        key = (username, hmac.new(self._cache_key, attempt, 'sha256').digest())
+        cached = self._verify_cache.get(key)
+        if cached is not None and cached[1] > time.monotonic():
+            self._verify_cache.move_to_end(key)
+            return cached[0]
+
+        stored = self._get_password_hashes().get(username)
+        # Unknown users go through the same hash and compare, so the response
+        # time does not reveal which usernames exist
+        salt, expected = stored if stored is not None else self._dummy_hash
+        result = hmac.compare_digest(expected, _hash_password(password, salt)) and stored is not None
+
+        self._verify_cache[key] = (result, time.monotonic() + _VERIFY_CACHE_TTL)
+        self._verify_cache.move_to_end(key)
+        if len(self._verify_cache) > _VERIFY_CACHE_SIZE:
+            self._verify_cache.popitem(last=False)
+        return result
 
     def login(self):
         """Performs the login process"""
@@ -136,22 +336,39 @@ class ModemSimulator:
         while attempts < max_attempts and not self.logged_in:
             print("\n")
             username = input("login: ")
-            password = getpass.getpass("Password: ")
+            if self.interactive:
+                password = getpass.getpass("Password: ")
+            else:
+                password = input("Password: ")
 
             # Simulate processing time
             sys.stdout.write("Authenticating")
-            for _ in range(3):
-                time.sleep(0.3)
-                sys.stdout.write(".")
-                sys.stdout.flush()
-            print()
-            time.sleep(0.5)
-
-            if username in self.users and self.users[username] == password:
+            sys.stdout.flush()
+
+            # Verify while the message is up; the time spent hashing is
+            # taken off the first pause instead of being added to it
+            started = time.monotonic()
+            authenticated = self.authenticate(username, password)
+            spent = time.monotonic() - started
+
+            # pause() flushes, so each dot shows up before the next wait
+            if self.tty_output:
+                for _ in range(3):
+                    self.pause(max(0.0, 0.3 - spent))
+                    spent = max(0.0, spent - 0.3)
+                    sys.stdout.write(".")
+                sys.stdout.write("\n")
+            else:
+                # Nobody watches the dots appear: one write, one combined pause
+                sys.stdout.write("...\n")
+                self.pause(max(0.0, 0.9 - spent))
+            self.pause(0.5)
+
+            if authenticated:
                 self.logged_in = True
                 self.username = username
                 self.slow_print(f"\n*** Login successful for {username} ***", 0.03)
-                time.sleep(0.5)
+                self.pause(0.5)
                 return True
             else:
                 attempts += 1
@@ -159,12 +376,12 @@ class ModemSimulator:
                 if remaining > 0:
                     self.slow_print(f"\nLogin incorrect", 0.03)
                     self.slow_print(f"Remaining attempts: {remaining}", 0.03)
-                    time.sleep(0.5)
+                    self.pause(0.5)
 
         if not self.logged_in:
             self.slow_print("\n*** Too many login failures ***", 0.03)
             self.slow_print("Disconnecting...", 0.03)
-            time.sleep(1)
+            self.pause(1)
             self.disconnect()
             return False
 
@@ -172,27 +389,19 @@ class ModemSimulator:
         """Displays welcome message after login"""
         _print = print_func if print_func else self.print_instant
 
-        _print("\n" + "="*60)
-        _print("  SCO UNIX System V/386 Release 3.2")
-        _print("="*60)
-        _print(f"\nLast login: {now().strftime('%a %b %d %H:%M:%S')} on tty1a")
-        _print(f"Terminal: vt100")
-        _print(f"\nYou have mail.")
-        _print("\n" + "-"*60)
-        _print("SCO UNIX System V/386 Release 3.2 (scohost)")
-        _print("-"*60 + "\n")
+        _print(f"{_WELCOME_HEADER}\n\nLast login: {now().strftime('%a %b %d %H:%M:%S')} on tty1a\n{_WELCOME_FOOTER}")
 
     def logout(self, print_func=None, slow_print_func=None):
         """Logout process"""
         _print = print_func if print_func else self.print_instant
         _slow_print = slow_print_func if slow_print_func else self.slow_print
 
-        _print("\n" + "="*60)
+        _print("\n" + _BAR)
         _slow_print("Closing session...", 0.03)
-        time.sleep(0.5)
+        self.pause(0.5)
         _slow_print(f"Goodbye, {self.username}!", 0.03)
-        _slow_print(f"Connect time: {random.randint(5, 45)} minutes", 0.03)
-        time.sleep(0.5)
+        _slow_print(f"Connect time: {self._randint(5, 45)} minutes", 0.03)
+        self.pause(0.5)
         self.disconnect(print_func=print_func, slow_print_func=slow_print_func)
 
     def disconnect(self, print_func=None, slow_print_func=None):
@@ -201,13 +410,11 @@ class ModemSimulator:
         _slow_print = slow_print_func if slow_print_func else self.slow_print
 
         _slow_print("\nDisconnecting...", 0.03)
-        time.sleep(0.5)
+        self.pause(0.5)
         _slow_print("+++ATH0", 0.03)
-        time.sleep(0.3)
+        self.pause(0.3)
         _slow_print("NO CARRIER", 0.03)
-        time.sleep(0.3)
-        _print("\n" + "="*60)
-        _print("  Connection closed")
-        _print("="*60 + "\n")
+        self.pause(0.3)
+        _print(_CLOSED_BANNER)
         self.connected = False
         self.logged_in = False
@@ -4,7 +4,7 @@ SCO UNIX System V/386 Modem Login Simulator
 Simulates a classic modem login to a SCO UNIX System from the 1990s era
 """
 
-import time
+import sys
 import argparse
 from vfs import VirtualFileSystem
 from modem import ModemSimulator
@@ -17,18 +17,27 @@ def main():
     parser = argparse.ArgumentParser(description='SCO UNIX Modem Simulator')
     parser.add_argument('--skip-dialin', action='store_true',
                        help='Skip dial-in process and login directly as root')
+    parser.add_argument('--fast', action='store_true',
+                       help='Print instantly without modem timing delays')
+    parser.add_argument('--virtual-time', action='store_true',
+                       help='Like --fast, but advance the simulated clock by the skipped delays')
     args = parser.parse_args()
 
+    # Block-buffer stdout even on a terminal; the simulator flushes itself
+    # before every pause and input() flushes before each prompt
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(line_buffering=False)
+
     print("\nStarting SCO UNIX Modem Simulator...")
     print("(Press Ctrl+C to abort)\n")
-    time.sleep(1)
+
+    # Create modem simulator
+    modem = ModemSimulator(fast=args.fast, virtual_time=args.virtual_time)
+    modem.pause(1)
 
     # Create virtual filesystem
     vfs = VirtualFileSystem()
 
-    # Create modem simulator
-    modem = ModemSimulator()
-
     try:
         if args.skip_dialin:
             # Skip dial-in and login directly as root
@@ -11,6 +11,15 @@ import json
 import importlib
 from vfs import VirtualFileSystem
 
+# Built-ins that end the session
+_LOGOUT_COMMANDS = frozenset({"logout", "exit", "quit"})
+
+# Commands called with the username instead of the filesystem
+_USER_COMMANDS = frozenset({"who", "w", "whoami", "ps", "kill"})
+
+# Answers accepted by the logout confirmation
+_YES_ANSWERS = frozenset({"y", "yes"})
+
 
 class Shell:
     """Interactive shell with bash-like history"""
@@ -152,7 +161,7 @@ class Shell:
             redirect_output = parts[1].strip()
             redirect_append = False
 
-        parts = command.strip().split()
+        parts = command.split()
         if not parts:
             return True
 
@@ -161,15 +170,14 @@ class Shell:
         if cmd in self.aliases:
             # Replace command with alias expansion
             alias_expansion = self.aliases[cmd]
-            # Combine alias expansion with remaining arguments
-            command = alias_expansion + " " + " ".join(parts[1:]) if len(parts) > 1 else alias_expansion
-            parts = command.strip().split()
+            # Combine alias expansion with remaining arguments (already split)
+            parts = alias_expansion.split() + parts[1:]
             cmd = parts[0].lower()
 
-        args = parts[1:] if len(parts) > 1 else []
+        args = parts[1:]
 
         # Handle special built-in commands
-        if cmd in ["logout", "exit", "quit"]:
+        if cmd in _LOGOUT_COMMANDS:
             return False
         elif cmd == "history":
             self._show_history(args, print_func)
@@ -179,41 +187,31 @@ class Shell:
         if redirect_output:
             # Capture output
             captured_output = []
-            def capture_print(text):
-                captured_output.append(text)
-
-            # Execute command with output capture
-            if cmd in self.commands:
-                func = self.commands[cmd]
-                if cmd in ["who", "w", "whoami", "ps", "kill"]:
-                    func(self.username, args, capture_print)
-                elif cmd == "alias":
-                    func(self.aliases, args, capture_print)
-                else:
-                    func(self.vfs, args, capture_print)
+            out = captured_output.append
+        else:
+            out = print_func
+
+        # Dynamic command dispatch
+        if cmd in self.commands:
+            func = self.commands[cmd]
+            # Check if command needs username (like who, whoami, w, ps, kill)
+            if cmd in _USER_COMMANDS:
+                func(self.username, args, out)
+            # Check if command needs aliases dict (like alias command)
+            elif cmd == "alias":
+                func(self.aliases, args, out)
             else:
-                capture_print(f"{cmd}: not found")
+                # Standard commands that need vfs
+                func(self.vfs, args, out)
+        else:
+            out(f"{cmd}: not found")
 
+        if redirect_output:
             # Write captured output to file
             content = "\n".join(captured_output) + "\n" if captured_output else ""
             success, error = self.vfs.write_file(redirect_output, content, redirect_append)
             if not success:
                 print_func(error)
-        else:
-            # Dynamic command dispatch
-            if cmd in self.commands:
-                func = self.commands[cmd]
-                # Check if command needs username (like who, whoami, w, ps, kill)
-                if cmd in ["who", "w", "whoami", "ps", "kill"]:
-                    func(self.username, args, print_func)
-                # Check if command needs aliases dict (like alias command)
-                elif cmd == "alias":
-                    func(self.aliases, args, print_func)
-                else:
-                    # Standard commands that need vfs
-                    func(self.vfs, args, print_func)
-            else:
-                print_func(f"{cmd}: not found")
 
         # Check if /unix file exists, print "Out of memory" if not
         unix_file = self.vfs.resolve_path("/unix")
@@ -263,14 +261,11 @@ class Shell:
 
     def run(self):
         """Run the interactive shell"""
+        # The user cannot change during a session, so neither can the prompt
+        prompt = self.get_prompt()
+
         while True:
             try:
-                # Unix root prompt
-                if self.username == "root":
-                    prompt = "# "
-                else:
-                    prompt = "$ "
-
                 command = input(prompt)
 
                 if not self.execute_command(command):
@@ -279,7 +274,7 @@ class Shell:
             except KeyboardInterrupt:
                 print("\n")
                 confirm = input("Do you really want to logout? (y/n): ")
-                if confirm.lower() in ['y', 'yes']:
+                if confirm.lower() in _YES_ANSWERS:
                     break
             except EOFError:
                 break
@@ -4,6 +4,7 @@ Test script for process simulation
 """
 
 from process_table import ProcessTable, Process
+from argparse_unix import parse_unix_args
 from commands.info import execute_ps
 from commands.process_ops import execute_kill
 
@@ -48,9 +49,11 @@ def test_ps_command(ptable):
     output.clear()
     print("\n--- ps -ef (full listing) ---")
     execute_ps("root", ["-e", "-f"], capture_output)
-    for line in output[:10]:  # Show first 10 lines
+    # ps prints its table in one call; count rows, not calls
+    lines = "\n".join(output).splitlines()
+    for line in lines[:10]:  # Show first 10 lines
         print(line)
-    print(f"... ({len(output)} total lines)")
+    print(f"... ({len(lines)} total lines)")
 
 
 def test_kill_command(ptable):
@@ -89,6 +92,28 @@ def test_kill_command(ptable):
         print(f"  {line}")
 
 
+def test_numeric_options():
+    """Test numeric options in the shared argument parser"""
+    print("\n\n=== Testing Numeric Options ===\n")
+
+    parsed = parse_unix_args(["-9", "123"])
+    if parsed.get_option('number') == 9 and list(parsed.get_positionals()) == ["123"]:
+        print("  ✓ -9 is stored as number 9")
+    else:
+        print("  ✗ -9 was not parsed as a number!")
+
+    # '²' passes str.isdigit() but int() rejects it: it must stay a flag
+    parsed = parse_unix_args(["-²"])
+    if parsed.has_flag('²') and parsed.get_option('number') is None:
+        print("  ✓ -² is treated as a flag")
+    else:
+        print("  ✗ -² was not treated as a flag!")
+
+    output = []
+    execute_kill("root", ["²"], output.append)
+    print(f"  kill ²: {output[0] if output else '(no output)'}")
+
+
 def test_queue_population():
     """Test that queues are populated"""
     print("\n\n=== Testing Queue Population ===\n")
@@ -136,6 +161,7 @@ if __name__ == "__main__":
     ptable = test_process_table()
     test_ps_command(ptable)
     test_kill_command(ptable)
+    test_numeric_options()
     test_queue_population()
 
     print("\n\n=== All Tests Complete ===")
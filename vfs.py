@@ -5,19 +5,49 @@ Implements a virtual filesystem for the SCO UNIX simulator
 
 import json
 import os
+import sys
+from collections import OrderedDict
 from datetime import datetime
 from fnmatch import fnmatch
 from system_time import now
 
+# Number of resolved paths VirtualFileSystem.resolve_path remembers
+_PATH_CACHE_SIZE = 128
+
+# ls -l row: type, permissions, links, owner, group, size, mtime, name
+_LONG_ENTRY_FORMAT = "%s%s  %2d %-8s %-8s %8s %s %s"
+
+
+class _TreeVersion:
+    """Change counter shared by all nodes of one tree"""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        # Bumped whenever a directory gains or loses a child, so caches of
+        # resolved paths can tell that the tree has changed
+        self.value = 0
+
 
 class VNode:
     """Virtual filesystem node (file or directory)"""
+
     def __init__(self, name, is_dir=False, parent=None, permissions="rwxr-xr-x", owner="root", group="sys", mtime=None):
-        self.name = name
+        # Interned, so child dict keys and lookups share one string object
+        self.name = sys.intern(name)
+        # Each tree (one per filesystem) has its own counter
+        self._tree = parent._tree if parent is not None else _TreeVersion()
         self.is_dir = is_dir
         self.parent = parent
         self.children = {} if is_dir else None
-        self.content = "" if not is_dir else None
+        # Child names in sorted order, rebuilt lazily after the children change
+        self._sorted_names = None
+        # Full path and the tree version it was computed at
+        self._full_path = None
+        self._full_path_version = None
+        # File content is kept as text, bytes or both; each form is derived lazily
+        self._content = "" if not is_dir else None
+        self._content_bytes = None
         self.permissions = permissions
         self.owner = owner
         self.group = group
@@ -25,27 +55,83 @@ class VNode:
         # Use provided mtime or default to system time
         self.mtime = mtime if mtime is not None else now()
 
+    @property
+    def content(self):
+        """File content as text (decoded from UTF-8 bytes on first access)"""
+        if self._content is None and self._content_bytes is not None:
+            self._content = self._content_bytes.decode('utf-8', errors='replace')
+        return self._content
+
+    @content.setter
+    def content(self, value):
+        self._content = value
+        self._content_bytes = None
+
+    @property
+    def content_bytes(self):
+        """File content as UTF-8 bytes (encoded from text on first access)"""
+        if self._content_bytes is None and self._content is not None:
+            self._content_bytes = self._content.encode('utf-8')
+        return self._content_bytes
+
+    @content_bytes.setter
+    def content_bytes(self, value):
+        self._content_bytes = value
+        self._content = None
+
     def get_full_path(self):
-        """Get the full path of this node"""
+        """Get the full path of this node (cached until the tree changes)"""
         if self.parent is None:
             return "/"
+        version = self._tree.value
+        if self._full_path_version == version:
+            return self._full_path
         path_parts = []
         node = self
         while node.parent is not None:
-            path_parts.insert(0, node.name)
+            path_parts.append(node.name)
             node = node.parent
-        return "/" + "/".join(path_parts) if path_parts else "/"
+        path_parts.reverse()
+        self._full_path = "/" + "/".join(path_parts)
+        self._full_path_version = version
+        return self._full_path
 
     def add_child(self, child):
         """Add a child node to this directory"""
         if self.is_dir:
+            if child.name not in self.children:
+                self._sorted_names = None
             self.children[child.name] = child
             child.parent = self
+            if child._tree is not self._tree:
+                self._adopt(child)
+            self._tree.value += 1
 
     def remove_child(self, name):
         """Remove a child node from this directory"""
         if self.is_dir and name in self.children:
             del self.children[name]
+            self._sorted_names = None
+            self._tree.value += 1
+
+    def _adopt(self, subtree):
+        """Move a subtree that was built elsewhere onto this node's counter"""
+        tree = self._tree
+        stack = [subtree]
+        while stack:
+            node = stack.pop()
+            node._tree = tree
+            # Its memoized path was stamped with the other tree's counter
+            node._full_path_version = None
+            if node.is_dir:
+                stack.extend(node.children.values())
+
+    def sorted_children(self):
+        """Get (name, node) pairs of the children sorted by name"""
+        if self._sorted_names is None:
+            self._sorted_names = sorted(self.children)
+        children = self.children
+        return [(name, children[name]) for name in self._sorted_names]
 
 
 class VirtualFileSystem:
@@ -55,6 +141,9 @@ class VirtualFileSystem:
         self.root = VNode("/", is_dir=True, parent=None)
         self.current_dir = self.root
         self.fs_config_path = fs_config_path
+        # (start node, path) -> resolved node or None, most recently used last
+        self._path_cache = OrderedDict()
+        self._path_cache_version = self.root._tree.value
 
         # Load filesystem structure from JSON if available, otherwise use default
         if os.path.exists(fs_config_path):
@@ -103,7 +192,8 @@ class VirtualFileSystem:
                 # Set content for files
                 if not is_dir and "content" in child_data:
                     child_node.content = child_data["content"]
-                    child_node.size = len(child_node.content)
+                    # Size in bytes, like a real file (and the tar member size)
+                    child_node.size = len(child_node.content_bytes)
 
                 # Add child to parent
                 parent_node.add_child(child_node)
@@ -170,7 +260,7 @@ PS1='# '
 TERM=vt100
 export TERM
 """
-        profile.size = len(profile.content)
+        profile.size = len(profile.content_bytes)
         self.root.add_child(profile)
 
         history = VNode(".history", is_dir=False, permissions="rw-------")
@@ -183,12 +273,34 @@ export TERM
         if not path:
             return self.current_dir
 
+        # A plain name in the current directory is a single dict lookup
+        if "/" not in path and path != "." and path != "..":
+            return self.current_dir.children.get(path)
+
+        # Relative paths are cached per working directory
+        start = self.root if path.startswith("/") else self.current_dir
+        key = (start, path)
+        cache = self._path_cache
+        version = self.root._tree.value
+        if self._path_cache_version != version:
+            # Nodes were added or removed since the entries were stored
+            cache.clear()
+            self._path_cache_version = version
+        elif key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+
+        node = self._walk_path(start, path)
+        cache[key] = node
+        if len(cache) > _PATH_CACHE_SIZE:
+            cache.popitem(last=False)
+        return node
+
+    def _walk_path(self, current, path):
+        """Walk path from the given start node, one component at a time"""
         # Handle absolute paths
         if path.startswith("/"):
-            current = self.root
             path = path[1:]  # Remove leading slash
-        else:
-            current = self.current_dir
 
         # Handle empty path (just "/")
         if not path:
@@ -306,61 +418,44 @@ export TERM
             else:
                 return [target.name], None
 
-        # Get all children
-        items = []
-        for name, node in target.children.items():
-            # Filter hidden files unless -a is specified
-            if not show_hidden and name.startswith('.'):
-                continue
-            items.append((name, node))
+        # Get all children; name order comes from the directory's cached index
+        if sort_by_time:
+            items = list(target.children.items())
+        else:
+            items = target.sorted_children()
+
+        # Filter hidden files unless -a is specified
+        if not show_hidden:
+            items = [item for item in items if not item[0].startswith('.')]
 
-        # Sort items
         if sort_by_time:
             # Sort by modification time (newest first)
             items.sort(key=lambda x: x[1].mtime, reverse=True)
-        else:
-            # Sort by name
-            items.sort(key=lambda x: x[0])
 
         # Reverse order if requested
         if reverse_sort:
             items.reverse()
 
         # Format entries
-        entries = []
-        for name, node in items:
-            if long_format:
-                entries.append(self._format_long_entry(node))
-            else:
-                entries.append(name)
-
-        return entries, None
+        if long_format:
+            return [self._format_long_entry(node) for name, node in items], None
+        return [name for name, node in items], None
 
     def _format_long_entry(self, node):
         """Format a directory entry in long format"""
-        # Type
-        type_char = "d" if node.is_dir else "-"
-
-        # Permissions
-        perms = node.permissions
-
         # Number of links (simplified)
         links = len(node.children) + 2 if node.is_dir else 1
 
-        # Owner and group
-        owner = node.owner.ljust(8)
-        group = node.group.ljust(8)
-
-        # Size
-        size = str(node.size).rjust(8)
-
-        # Time
-        mtime = node.mtime.strftime("%b %d %H:%M")
-
-        # Name
-        name = node.name
-
-        return f"{type_char}{perms}  {links:2} {owner} {group} {size} {mtime} {name}"
+        return _LONG_ENTRY_FORMAT % (
+            "d" if node.is_dir else "-",
+            node.permissions,
+            links,
+            node.owner,
+            node.group,
+            node.size,
+            node.mtime.strftime("%b %d %H:%M"),
+            node.name,
+        )
 
     def read_file(self, path):
         """Read file contents"""
@@ -395,13 +490,13 @@ export TERM
                 node.content += content
             else:
                 node.content = content
-            node.size = len(node.content)
+            node.size = len(node.content_bytes)
             node.mtime = now()
         else:
             # Create new file
             new_file = VNode(filename, is_dir=False, parent=parent, permissions="rw-r--r--")
             new_file.content = content
-            new_file.size = len(content)
+            new_file.size = len(new_file.content_bytes)
             parent.add_child(new_file)
 
         return True, None
@@ -448,6 +543,8 @@ export TERM
         # Create a new root directory
         self.root = VNode("/", is_dir=True, parent=None)
         self.current_dir = self.root
+        self._path_cache.clear()
+        self._path_cache_version = self.root._tree.value
 
         # Reload filesystem structure from JSON
         if os.path.exists(self.fs_config_path):
@@ -34,6 +34,12 @@ sessions = {}
 # Global flag for skip dialin mode
 skip_dialin_mode = False
 
+# Cursor key sequences forwarded to process_escape_sequence
+_ARROW_KEYS = frozenset({'\x1b[A', '\x1b[B', '\x1b[C', '\x1b[D'})
+
+# Commands that end the web session
+_EXIT_COMMANDS = frozenset({'exit', 'logout'})
+
 
 class WebTerminal:
     """Handles terminal I/O for web-based terminal with VT100 support"""
@@ -118,7 +124,7 @@ class WebTerminal:
                 return
             elif len(self.escape_sequence) >= 3:
                 # Check for arrow keys
-                if self.escape_sequence in ['\x1b[A', '\x1b[B', '\x1b[C', '\x1b[D']:
+                if self.escape_sequence in _ARROW_KEYS:
                     self.process_escape_sequence(self.escape_sequence)
                     self.escape_sequence = ""
                     return
@@ -242,7 +248,7 @@ class WebTerminal:
                     self.echo_enabled = True
                     logging.info(f"[{self.sid[:8]}] Received password")
 
-                    if username in self.modem.users and self.modem.users[username] == password:
+                    if self.modem.authenticate(username, password):
                         logging.info(f"[{self.sid[:8]}] Login successful for user: {username}")
                         self.username = username
                         self.modem.show_welcome_message(username, print_func=self.custom_print)
@@ -289,7 +295,7 @@ class WebTerminal:
                     self.shell.history.append(command)
 
                 # Check for exit
-                if command.lower() in ['exit', 'logout']:
+                if command.lower() in _EXIT_COMMANDS:
                     break
 
                 # Execute command